@@ -0,0 +1,204 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True, language_level=3
+"""
+Compiled kernel for enumerate_connected_subsets_for_roots in comparison.py.
+
+Same DFS as the pure-Python loop, but every bitset is a uint64_t (n <= 64)
+and each hit is a (mask, sum) pair appended to a growable C buffer; no
+strings are built during the search. The search runs without the GIL, so
+callers can fan roots out over plain threads.
+"""
+
+from libc.stdint cimport uint64_t, int64_t, int32_t
+from libc.stdlib cimport malloc, realloc, free
+from libc.string cimport memcpy
+
+import numpy as np
+
+cdef extern from *:
+    int __builtin_ctzll(unsigned long long x) nogil
+    int __builtin_popcountll(unsigned long long x) nogil
+
+ctypedef struct Frame:
+    uint64_t S
+    uint64_t C
+    uint64_t X
+    int64_t ssum
+
+
+cdef struct Hits:
+    uint64_t* mask
+    int32_t* ssum
+    int64_t count
+    int64_t capacity
+
+
+cdef inline bint push_hit(Hits* hits, uint64_t mask, int64_t ssum) noexcept nogil:
+    # Grow geometrically; returns False if realloc fails.
+    cdef int64_t cap
+    cdef uint64_t* m
+    cdef int32_t* s
+    if hits.count == hits.capacity:
+        cap = hits.capacity * 2 if hits.capacity else 1 << 16
+        m = <uint64_t*>realloc(hits.mask, cap * sizeof(uint64_t))
+        if m == NULL:
+            return False
+        hits.mask = m
+        s = <int32_t*>realloc(hits.ssum, cap * sizeof(int32_t))
+        if s == NULL:
+            return False
+        hits.ssum = s
+        hits.capacity = cap
+    hits.mask[hits.count] = mask
+    hits.ssum[hits.count] = <int32_t>ssum
+    hits.count += 1
+    return True
+
+
+cdef bint enumerate_root(int r, const int64_t* areas, const int64_t* top_sum,
+                         const uint64_t* nbrs, uint64_t full_mask, int64_t lower,
+                         int64_t upper, Frame* stack, Hits* hits) noexcept nogil:
+    cdef uint64_t S, C, X, vbit, cm, ex, newS, newC
+    cdef uint64_t U = full_mask & ~((<uint64_t>1 << r) - 1)
+    cdef uint64_t root = <uint64_t>1 << r
+    cdef int64_t ssum, new_sum
+    cdef int v, base, lo, hi
+    cdef int sp = 1
+    cdef Frame tmp
+
+    # Neighbourhoods clipped to U once per root; candidates never leave U,
+    # so only entries r..63 are ever read.
+    cdef uint64_t adj_U[64]
+    for v in range(r, 64):
+        adj_U[v] = nbrs[v] & U if (full_mask >> v) & 1 else 0
+
+    stack[0].S = root
+    stack[0].C = adj_U[r] & ~root
+    stack[0].X = 0
+    stack[0].ssum = areas[r]
+
+    while sp:
+        sp -= 1
+        S = stack[sp].S
+        C = stack[sp].C
+        X = stack[sp].X
+        ssum = stack[sp].ssum
+
+        if lower <= ssum <= upper:
+            if not push_hit(hits, S, ssum):
+                return False
+
+        if C == 0:
+            continue
+
+        cm = C
+        ex = X
+        base = sp
+        while cm:
+            vbit = cm & (~cm + 1)
+            v = __builtin_ctzll(vbit)
+            cm ^= vbit
+
+            new_sum = ssum + areas[v]
+            if new_sum > upper:
+                break  # bits are in ascending area order; nothing later fits
+
+            newS = S | vbit
+            newC = cm | (adj_U[v] & ~newS & ~ex)
+            if newC == 0 or new_sum + areas[__builtin_ctzll(newC)] > upper:
+                # Leaf (the lowest bit of newC is its smallest area): record
+                # it here instead of a push/pop round trip.
+                if new_sum >= lower and not push_hit(hits, newS, new_sum):
+                    return False
+            elif new_sum + top_sum[__builtin_popcountll(U & ~newS & ~ex)] >= lower:
+                # Only descend if the k largest areas, k = vertices still
+                # addable, could lift this subtree into the band.
+                stack[sp].S = newS
+                stack[sp].C = newC
+                stack[sp].X = ex
+                stack[sp].ssum = new_sum
+                sp += 1
+
+            ex |= vbit
+
+        # Reverse the children so the lowest-bit child is popped first,
+        # matching the Python loop's output order.
+        lo = base
+        hi = sp - 1
+        while lo < hi:
+            tmp = stack[lo]
+            stack[lo] = stack[hi]
+            stack[hi] = tmp
+            lo += 1
+            hi -= 1
+
+    return True
+
+
+def enumerate_roots(roots, area_arr, adj, uint64_t full_mask, int64_t lower,
+                    int64_t upper):
+    """
+    Enumerate connected subsets for the given root indices.
+    Returns (masks, sums) as uint64/int32 NumPy arrays, one entry per hit.
+    """
+    cdef int n = len(area_arr)
+    if n > 64:
+        raise ValueError("compiled kernel supports at most 64 states")
+    if len(roots) > n:
+        raise ValueError("more roots than states")
+
+    cdef int64_t areas[64]
+    cdef int64_t top_sum[65]
+    cdef uint64_t nbrs[64]
+    cdef int root_idx[64]
+    cdef int i
+    cdef int num_roots = len(roots)
+    for i in range(n):
+        areas[i] = area_arr[i]
+        nbrs[i] = adj[i]
+    for i in range(num_roots):
+        if not 0 <= roots[i] < n:
+            raise ValueError(f"root index {roots[i]} out of range for {n} states")
+        root_idx[i] = roots[i]
+    # top_sum[k]: total of the k largest areas (areas are in ascending order).
+    top_sum[0] = 0
+    for i in range(n):
+        top_sum[i + 1] = top_sum[i] + areas[n - 1 - i]
+
+    # Each pop pushes at most popcount(C) < n children, so depth * n frames
+    # is a hard bound on the stack size.
+    cdef Frame* stack = <Frame*>malloc(n * n * sizeof(Frame) + sizeof(Frame))
+    if stack == NULL:
+        raise MemoryError()
+
+    cdef Hits hits
+    hits.mask = NULL
+    hits.ssum = NULL
+    hits.count = 0
+    hits.capacity = 0
+
+    cdef bint ok = True
+    cdef uint64_t[::1] mask_view
+    cdef int32_t[::1] sum_view
+    with nogil:
+        for i in range(num_roots):
+            ok = enumerate_root(root_idx[i], areas, top_sum, nbrs, full_mask,
+                                lower, upper, stack, &hits)
+            if not ok:
+                break
+    free(stack)
+
+    try:
+        if not ok:
+            raise MemoryError()
+        masks = np.empty(hits.count, dtype=np.uint64)
+        sums = np.empty(hits.count, dtype=np.int32)
+        mask_view = masks
+        sum_view = sums
+        if hits.count:
+            memcpy(&mask_view[0], hits.mask, hits.count * sizeof(uint64_t))
+            memcpy(&sum_view[0], hits.ssum, hits.count * sizeof(int32_t))
+    finally:
+        free(hits.mask)
+        free(hits.ssum)
+
+    return masks, sums
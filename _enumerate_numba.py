@@ -0,0 +1,128 @@
+"""
+Numba build of the enumeration kernel, for machines without Cython or a C
+compiler. Same search as _enumerate.pyx and the pure-Python loop in
+comparison.py, and the same hit order; bitsets are int64 (n <= 63).
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def _lowbit_index(x):
+    # x is a power of two; count trailing zeros without a float log2.
+    v = 0
+    while (x & 1) == 0:
+        x >>= 1
+        v += 1
+    return v
+
+
+@njit(cache=True, nogil=True)
+def _popcount(x):
+    k = 0
+    while x:
+        x &= x - 1
+        k += 1
+    return k
+
+
+@njit(cache=True, nogil=True)
+def enumerate_roots_numba(roots, area_arr, adj, full_mask, lower, upper):
+    """
+    Enumerate connected subsets for the given root indices.
+    Returns (masks, sums) as int64 arrays, one entry per hit.
+    """
+    n = area_arr.shape[0]
+
+    # top_sum[k]: total of the k largest areas (areas are in ascending order).
+    top_sum = np.zeros(n + 1, dtype=np.int64)
+    for i in range(n):
+        top_sum[i + 1] = top_sum[i] + area_arr[n - 1 - i]
+
+    # Each pop pushes fewer than n children, so n * n + 1 frames suffice.
+    cap = n * n + 1
+    stk_S = np.empty(cap, dtype=np.int64)
+    stk_C = np.empty(cap, dtype=np.int64)
+    stk_X = np.empty(cap, dtype=np.int64)
+    stk_sum = np.empty(cap, dtype=np.int64)
+    adj_U = np.empty(n, dtype=np.int64)
+
+    hits_mask = np.empty(1 << 16, dtype=np.int64)
+    hits_sum = np.empty(1 << 16, dtype=np.int64)
+    count = 0
+
+    for r in roots:
+        U = full_mask & ~((1 << r) - 1)
+        for v in range(n):
+            adj_U[v] = adj[v] & U
+        root = 1 << r
+
+        stk_S[0] = root
+        stk_C[0] = adj_U[r] & ~root
+        stk_X[0] = 0
+        stk_sum[0] = area_arr[r]
+        sp = 1
+
+        while sp:
+            sp -= 1
+            S = stk_S[sp]
+            C = stk_C[sp]
+            X = stk_X[sp]
+            ssum = stk_sum[sp]
+
+            if lower <= ssum <= upper:
+                if count == hits_mask.shape[0]:
+                    hits_mask = np.concatenate((hits_mask, np.empty_like(hits_mask)))
+                    hits_sum = np.concatenate((hits_sum, np.empty_like(hits_sum)))
+                hits_mask[count] = S
+                hits_sum[count] = ssum
+                count += 1
+
+            if C == 0:
+                continue
+
+            cm = C
+            ex = X
+            base = sp
+            while cm:
+                vbit = cm & -cm
+                v = _lowbit_index(vbit)
+                cm ^= vbit
+
+                new_sum = ssum + area_arr[v]
+                if new_sum > upper:
+                    break  # bits are in ascending area order; nothing later fits
+
+                newS = S | vbit
+                newC = cm | (adj_U[v] & ~newS & ~ex)
+                if newC == 0 or new_sum + area_arr[_lowbit_index(newC & -newC)] > upper:
+                    # Leaf: record it here instead of a push/pop round trip.
+                    if new_sum >= lower:
+                        if count == hits_mask.shape[0]:
+                            hits_mask = np.concatenate((hits_mask, np.empty_like(hits_mask)))
+                            hits_sum = np.concatenate((hits_sum, np.empty_like(hits_sum)))
+                        hits_mask[count] = newS
+                        hits_sum[count] = new_sum
+                        count += 1
+                elif new_sum + top_sum[_popcount(U & ~newS & ~ex)] >= lower:
+                    stk_S[sp] = newS
+                    stk_C[sp] = newC
+                    stk_X[sp] = ex
+                    stk_sum[sp] = new_sum
+                    sp += 1
+
+                ex |= vbit
+
+            # Reverse the children so the lowest-bit child is popped first.
+            lo = base
+            hi = sp - 1
+            while lo < hi:
+                stk_S[lo], stk_S[hi] = stk_S[hi], stk_S[lo]
+                stk_C[lo], stk_C[hi] = stk_C[hi], stk_C[lo]
+                stk_X[lo], stk_X[hi] = stk_X[hi], stk_X[lo]
+                stk_sum[lo], stk_sum[hi] = stk_sum[hi], stk_sum[lo]
+                lo += 1
+                hi -= 1
+
+    return hits_mask[:count].copy(), hits_sum[:count].copy()
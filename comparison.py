@@ -12,22 +12,56 @@ import csv
 import json
 import math
 import os
+import random
 import re
-import tempfile
-from multiprocessing import Pool, cpu_count
-from typing import Dict, List, Tuple
-
-import pandas as pd
-import networkx as nx
-import requests
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from multiprocessing import cpu_count
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compiled enumeration kernel (_enumerate.pyx), built on import via pyximport.
+# Falls back to the pure-Python loop when Cython or a C compiler is missing.
+try:
+    import pyximport
+    pyximport.install(language_level=3)
+    from _enumerate import enumerate_roots as _enumerate_roots_c
+except ImportError:
+    _enumerate_roots_c = None
+
+# Numba build of the same kernel (_enumerate_numba.py), for when Cython is
+# unavailable; also releases the GIL.
+_enumerate_roots_numba = None
+if _enumerate_roots_c is None:
+    try:
+        from _enumerate_numba import enumerate_roots_numba as _enumerate_roots_numba
+    except ImportError:
+        pass
 
 CENSUS_STATE_AREA_URL = "https://www.census.gov/geographies/reference-files/2010/geo/state-area.html"
 HOLMES_BORDLIST_URL   = "https://users.econ.umn.edu/~holmes/data/BORDLIST.html"
 
+# Local copies of the fetched inputs; delete them to re-download.
+STATE_AREAS_CACHE = "data/state_areas.json"
+ADJACENCY_CACHE   = "data/adjacency.json"
+
 GREENLAND_KM2 = 2_166_086  # CIA World Factbook
 LOWER = math.ceil(0.98 * GREENLAND_KM2)
 UPPER = GREENLAND_KM2
 
+# How many closest-to-Greenland combinations the web app gets.
+MAX_COMBINATIONS = 10000
+
+# On-disk record for one hit: state bitmask + total area, packed (12 bytes).
+HITS_DTYPE = np.dtype([("mask", "<u8"), ("sum", "<i4")])
+
 ABBR_TO_STATE = {
     "AL":"Alabama","AK":"Alaska","AZ":"Arizona","AR":"Arkansas","CA":"California","CO":"Colorado","CT":"Connecticut",
     "DE":"Delaware","FL":"Florida","GA":"Georgia","HI":"Hawaii","ID":"Idaho","IL":"Illinois","IN":"Indiana","IA":"Iowa",
@@ -40,6 +74,10 @@ ABBR_TO_STATE = {
 }
 
 def fetch_state_areas_km2() -> Dict[str, int]:
+    # Imported here so runs served from the cache never load pandas/requests.
+    import pandas as pd
+    import requests
+
     html = requests.get(CENSUS_STATE_AREA_URL, timeout=60).text
     tables = pd.read_html(html)
     if not tables:
@@ -63,37 +101,74 @@ def fetch_state_areas_km2() -> Dict[str, int]:
         "West Virginia","Wisconsin","Wyoming"
     ])
 
-    out = {}
-    for _, row in df.iterrows():
-        name = str(row[name_col]).strip()
-        if name in states_50 and pd.notna(row[area_col]):
-            out[name] = int(round(float(row[area_col])))
+    names = df[name_col].astype(str).str.strip()
+    mask = names.isin(states_50) & df[area_col].notna()
+    areas = df.loc[mask, area_col].astype(float).round().astype(int)
+    out = dict(zip(names[mask], areas.tolist()))
     if len(out) != 50:
         raise RuntimeError(f"Expected 50 states, got {len(out)}.")
     return out
 
-def fetch_lower48_adjacency() -> nx.Graph:
+def fetch_lower48_adjacency() -> Dict[str, Set[str]]:
+    import requests
+
     html = requests.get(HOLMES_BORDLIST_URL, timeout=60).text
     pairs = re.findall(r"\b([A-Z]{2})-([A-Z]{2})\b", html)
-    G = nx.Graph()
 
     # Add only the 48 contiguous states present in the border list (AK/HI excluded by construction)
     lower48 = set(ABBR_TO_STATE[a] for a, b in pairs if a in ABBR_TO_STATE) | set(ABBR_TO_STATE[b] for a, b in pairs if b in ABBR_TO_STATE)
     lower48 -= {"Alaska","Hawaii","District of Columbia"}  # keep "states" only
-    G.add_nodes_from(sorted(lower48))
+    adj = {s: set() for s in sorted(lower48)}
 
     for a, b in pairs:
         if a in ABBR_TO_STATE and b in ABBR_TO_STATE:
             sa, sb = ABBR_TO_STATE[a], ABBR_TO_STATE[b]
-            if sa in G and sb in G:
-                G.add_edge(sa, sb)
+            if sa in adj and sb in adj:
+                adj[sa].add(sb)
+                adj[sb].add(sa)
 
     # Sanity: lower 48 should be connected
-    if not nx.is_connected(G):
+    frontier = list(adj)[:1]
+    seen = set(frontier)
+    while frontier:
+        for nb in adj[frontier.pop()]:
+            if nb not in seen:
+                seen.add(nb)
+                frontier.append(nb)
+    if not adj or len(seen) != len(adj):
         raise RuntimeError("Adjacency graph is unexpectedly not connected.")
-    return G
+    return adj
 
-def mask_helpers(states: List[str], G: nx.Graph, areas: Dict[str, int]):
+def load_state_areas_km2() -> Dict[str, int]:
+    """
+    State areas from STATE_AREAS_CACHE, fetched from the Census on first use.
+    """
+    if os.path.exists(STATE_AREAS_CACHE):
+        with open(STATE_AREAS_CACHE) as f:
+            return json.load(f)
+    areas = fetch_state_areas_km2()
+    os.makedirs(os.path.dirname(STATE_AREAS_CACHE), exist_ok=True)
+    with open(STATE_AREAS_CACHE, "w") as f:
+        json.dump(areas, f, indent=2, sort_keys=True)
+    return areas
+
+def load_lower48_adjacency() -> Dict[str, Set[str]]:
+    """
+    Lower-48 adjacency from ADJACENCY_CACHE, fetched from Holmes on first use.
+    """
+    if os.path.exists(ADJACENCY_CACHE):
+        with open(ADJACENCY_CACHE) as f:
+            return {s: set(nbs) for s, nbs in json.load(f).items()}
+    adj = fetch_lower48_adjacency()
+    os.makedirs(os.path.dirname(ADJACENCY_CACHE), exist_ok=True)
+    with open(ADJACENCY_CACHE, "w") as f:
+        json.dump({s: sorted(nbs) for s, nbs in adj.items()}, f, indent=2, sort_keys=True)
+    return adj
+
+def mask_helpers(states: List[str], neighbors: Dict[str, Set[str]], areas: Dict[str, int]):
+    # Number states by ascending area: the search scans candidates low bit
+    # first and can stop at the first one that no longer fits under UPPER.
+    states = sorted(states, key=lambda s: (areas[s], s))
     idx = {s:i for i,s in enumerate(states)}
     n = len(states)
     full = (1 << n) - 1
@@ -102,134 +177,304 @@ def mask_helpers(states: List[str], G: nx.Graph, areas: Dict[str, int]):
     for s in states:
         i = idx[s]
         m = 0
-        for nb in G.neighbors(s):
+        for nb in neighbors[s]:
             if nb in idx:
                 m |= 1 << idx[nb]
         adj[i] = m
-    return idx, area_arr, adj, full
+    return states, idx, area_arr, adj, full
 
-def enumerate_connected_subsets_for_roots(args: Tuple) -> str:
+def enumerate_connected_subsets_for_roots(args: Tuple) -> Tuple[np.ndarray, np.ndarray]:
     """
     Worker function: enumerate connected subsets for a range of root indices.
-    Writes results to a temp file and returns the filename.
+    Returns (masks, sums): the state bitmask and total area of every hit.
+    Bits must be numbered by ascending area, as mask_helpers does.
     """
     roots, states, area_arr, adj, full_mask, lower, upper = args
     n = len(states)
 
-    # Create temp file for this worker's results
-    fd, temp_path = tempfile.mkstemp(suffix=".csv", prefix="greenland_worker_")
-
-    with os.fdopen(fd, "w", newline="") as f:
-        writer = csv.writer(f)
-        count = 0
-
-        for r in roots:
-            U = full_mask & ~((1 << r) - 1)
-            root = 1 << r
-            cand = adj[r] & U & ~root
-            sum0 = area_arr[r]
-
-            stack = [(root, cand, 0, sum0)]
-
-            while stack:
-                S, C, X, ssum = stack.pop()
-
-                if lower <= ssum <= upper:
-                    st = mask_to_states(S, states)
-                    writer.writerow([len(st), ssum, round(100.0 * ssum / GREENLAND_KM2, 3), ", ".join(st)])
-                    count += 1
-
-                if ssum >= upper or C == 0:
-                    continue
-
-                cm = C
-                ex = X
-                children = []
-                while cm:
-                    vbit = cm & -cm
-                    v = vbit.bit_length() - 1
-                    cm ^= vbit
-
-                    new_sum = ssum + area_arr[v]
-                    if new_sum <= upper:
-                        newS = S | vbit
-                        newC = cm | (adj[v] & U & ~newS & ~ex)
-                        children.append((newS, newC, ex, new_sum))
-
-                    ex |= vbit
-
-                stack.extend(reversed(children))
-
-    return temp_path, count
-
-def mask_to_states(mask: int, states: List[str]) -> List[str]:
-    out = []
-    i = 0
-    while mask:
-        lsb = mask & -mask
-        j = lsb.bit_length() - 1
-        out.append(states[j])
-        mask ^= lsb
-        i += 1
-    return out
+    if _enumerate_roots_c is not None:
+        return _enumerate_roots_c(roots, area_arr, adj, full_mask, lower, upper)
+    if _enumerate_roots_numba is not None:
+        if n > 63:
+            raise ValueError("Numba kernel supports at most 63 states")
+        masks, sums = _enumerate_roots_numba(np.asarray(roots, dtype=np.int64),
+                                             np.asarray(area_arr, dtype=np.int64),
+                                             np.asarray(adj, dtype=np.int64),
+                                             full_mask, lower, upper)
+        return masks.view(np.uint64), sums.astype(np.int32)
+
+    masks = array("Q")
+    sums = array("i")
+    # top_sum[k]: total of the k largest areas (areas are in ascending order).
+    top_sum = [0]
+    for a in reversed(area_arr):
+        top_sum.append(top_sum[-1] + a)
+
+    for r in roots:
+        U = full_mask & ~((1 << r) - 1)
+        adj_U = [a & U for a in adj]  # U is fixed per root; clip neighbourhoods once
+        root = 1 << r
+        cand = adj_U[r] & ~root
+        sum0 = area_arr[r]
+
+        stack = [(root, cand, 0, sum0)]
+
+        while stack:
+            S, C, X, ssum = stack.pop()
+
+            if lower <= ssum <= upper:
+                masks.append(S)
+                sums.append(ssum)
+
+            if C == 0:
+                continue
+
+            cm = C
+            ex = X
+            base = len(stack)
+            while cm:
+                vbit = cm & -cm
+                v = vbit.bit_length() - 1
+                cm ^= vbit
+
+                new_sum = ssum + area_arr[v]
+                if new_sum > upper:
+                    break  # bits are in ascending area order; nothing later fits
+
+                newS = S | vbit
+                newC = cm | (adj_U[v] & ~newS & ~ex)
+                if newC == 0 or new_sum + area_arr[(newC & -newC).bit_length() - 1] > upper:
+                    # Leaf (the lowest bit of newC is its smallest area):
+                    # record it here rather than push and pop it.
+                    if new_sum >= lower:
+                        masks.append(newS)
+                        sums.append(new_sum)
+                elif new_sum + top_sum[(U & ~newS & ~ex).bit_count()] >= lower:
+                    # Only descend if the k largest areas, k = vertices still
+                    # addable, could lift this subtree into the band.
+                    stack.append((newS, newC, ex, new_sum))
+
+                ex |= vbit
+
+            # Children were pushed straight onto the stack; flip them so the
+            # lowest-bit child is popped first, as in the compiled kernel.
+            if len(stack) - base > 1:
+                stack[base:] = stack[base:][::-1]
+
+    return np.frombuffer(masks, dtype=np.uint64), np.frombuffer(sums, dtype=np.int32)
+
+# Search inputs shared by every task, installed once per worker by
+# _init_worker instead of being pickled along with each task.
+_worker_state: Tuple = ()
+
+def _init_worker(*state):
+    global _worker_state
+    _worker_state = state
+
+def _enumerate_worker_roots(roots: List[int]) -> Tuple[np.ndarray, np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    masks, sums = enumerate_connected_subsets_for_roots((roots, *_worker_state))
+    # Each worker also keeps its own top-K, so the parent can build the JSON
+    # without another pass over every hit.
+    return masks, sums, closest_hits(masks, sums, MAX_COMBINATIONS)
+
+def estimate_tree_size(r: int, area_arr: List[int], adj: List[int], full_mask: int, upper: int,
+                       probes: int = 512, seed: int = 0) -> float:
+    """
+    Knuth's random-probe estimate of the number of search nodes under root r:
+    walk random root-to-leaf paths and sum the running product of branching
+    factors. Cheap, and good enough to schedule the largest roots first.
+    """
+    rnd = random.Random(seed)
+    U = full_mask & ~((1 << r) - 1)
+    adj_U = [a & U for a in adj]
+    total = 0.0
+    for _ in range(probes):
+        S, C, X, ssum = 1 << r, adj_U[r] & ~(1 << r), 0, area_arr[r]
+        size = weight = 1.0
+        while True:
+            children = []
+            cm = C
+            ex = X
+            while cm:
+                vbit = cm & -cm
+                v = vbit.bit_length() - 1
+                cm ^= vbit
+                new_sum = ssum + area_arr[v]
+                if new_sum > upper:
+                    break
+                newS = S | vbit
+                children.append((newS, cm | (adj_U[v] & ~newS & ~ex), ex, new_sum))
+                ex |= vbit
+            if not children:
+                break
+            weight *= len(children)
+            size += weight
+            S, C, X, ssum = rnd.choice(children)
+        total += size
+    return total / probes
+
+def states_file_for(hits_file: str) -> str:
+    """
+    Sidecar listing the state behind each mask bit, in bit order.
+    """
+    return os.path.splitext(hits_file)[0] + ".states.json"
+
+def write_hits_file(path: str, states: List[str],
+                    results: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    """
+    Merge per-worker (masks, sums) buffers into one memory-mapped binary file.
+    The file is sized up front and each buffer is copied into its own slice,
+    so the merge is a single pass with no intermediate concatenation.
+    """
+    with open(states_file_for(path), "w") as f:
+        json.dump(states, f)
+
+    total = sum(len(m) for m, _ in results)
+    if total == 0:
+        open(path, "wb").close()
+        return np.zeros(0, dtype=HITS_DTYPE)
+
+    hits = np.memmap(path, dtype=HITS_DTYPE, mode="w+", shape=(total,))
+    offset = 0
+    while results:
+        m, s = results.pop(0)  # drop each worker buffer as soon as it is copied
+        hits["mask"][offset:offset + len(m)] = m
+        hits["sum"][offset:offset + len(m)] = s
+        offset += len(m)
+    hits.flush()
+    return hits
+
+def read_hits_file(path: str) -> Tuple[List[str], np.ndarray]:
+    """
+    Map a file written by write_hits_file; returns (states, hits).
+    """
+    with open(states_file_for(path)) as f:
+        states = json.load(f)
+    if os.path.getsize(path) == 0:
+        return states, np.zeros(0, dtype=HITS_DTYPE)
+    return states, np.memmap(path, dtype=HITS_DTYPE, mode="r")
+
+def hits_percent(sums: np.ndarray) -> np.ndarray:
+    return np.round(100.0 * sums / GREENLAND_KM2, 3)
+
+def alphabetical_bits(masks: np.ndarray, states: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    (rows, n) membership matrix with columns in alphabetical state order,
+    plus the state names in that order. Bits follow mask_helpers' area order.
+    """
+    order = np.argsort(states, kind="stable")
+    bits = np.unpackbits(masks.astype("<u8").view(np.uint8).reshape(-1, 8),
+                         axis=1, bitorder="little")[:, order]
+    return bits, [states[i] for i in order]
+
+def masks_to_states(masks: np.ndarray, states: List[str]) -> List[List[str]]:
+    """
+    Decode masks to state-name lists, each listed alphabetically.
+    """
+    bits, names = alphabetical_bits(masks, states)
+    # nonzero() walks the matrix row by row, column by column
+    flat = np.array(names, dtype=object)[np.nonzero(bits)[1]].tolist()
+    ends = np.cumsum(bits.sum(axis=1)).tolist()
+    return [flat[a:b] for a, b in zip([0] + ends[:-1], ends)]
+
+def masks_to_joined(masks: np.ndarray, states: List[str]) -> Tuple[np.ndarray, List[bytes]]:
+    """
+    Decode masks straight to (state counts, ", "-joined alphabetical names)
+    as UTF-8 bytes. The alphabetical bits are repacked into bytes and each
+    byte is looked up in a 256-entry table of pre-joined, pre-encoded names,
+    so a row costs one join of at most n/8 pieces rather than a list of names.
+    """
+    bits, names = alphabetical_bits(masks, states)
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    columns = []
+    for k in range(packed.shape[1]):
+        group = [name.encode() for name in names[8 * k:8 * k + 8]]
+        table = np.array([b", ".join(g for j, g in enumerate(group) if b >> j & 1) for b in range(256)],
+                         dtype=object)
+        columns.append(table[packed[:, k]])
+    return bits.sum(axis=1), [b", ".join(filter(None, parts)) for parts in zip(*columns)]
+
+def write_combinations_csv(path: str, states: List[str], hits: np.ndarray,
+                           chunksize: int = 1_000_000):
+    """
+    Decode HITS_DTYPE records to CSV rows, one vectorized chunk at a time.
+    Rows are formatted as bytes and written directly, in the same dialect
+    csv.writer produces: CRLF line endings, floats as repr, and the states
+    field quoted only when it lists more than one state.
+    """
+    with open(path, "wb", buffering=1 << 20) as f:
+        f.write(b"states_count,total_km2,percent_of_greenland,states\r\n")
+
+        for start in range(0, len(hits), chunksize):
+            chunk = hits[start:start + chunksize]
+            counts, joined = masks_to_joined(chunk["mask"], states)
+            f.write(b"".join(
+                (b'%d,%d,%a,"%s"\r\n' if count > 1 else b"%d,%d,%a,%s\r\n") % (count, km2, pct, names)
+                for count, km2, pct, names in zip(counts.tolist(), chunk["sum"].tolist(),
+                                                  hits_percent(chunk["sum"]).tolist(), joined)
+            ))
 
 def main():
     print(f"Greenland area: {GREENLAND_KM2:,} km²")
     print(f"Target band: [{LOWER:,}, {UPPER:,}] km² (within 2%, not over)")
 
-    areas50 = fetch_state_areas_km2()
-    G = fetch_lower48_adjacency()
+    areas50 = load_state_areas_km2()
+    neighbors = load_lower48_adjacency()
 
     # Restrict to lower 48 (contiguous) states only
-    lower48_states = sorted(G.nodes())
+    lower48_states = sorted(neighbors)
     areas48 = {s: areas50[s] for s in lower48_states}
 
-    idx, area_arr, adj, full = mask_helpers(lower48_states, G, areas48)
+    bit_states, idx, area_arr, adj, full = mask_helpers(lower48_states, neighbors, areas48)
     n = len(lower48_states)
 
     # Determine number of workers
     num_workers = min(cpu_count(), n)
     print(f"Using {num_workers} parallel workers")
 
-    # Distribute roots across workers (each root's search tree is independent)
-    root_chunks = [[] for _ in range(num_workers)]
-    for r in range(n):
-        root_chunks[r % num_workers].append(r)
-
-    # Prepare arguments for each worker
-    worker_args = [
-        (roots, lower48_states, area_arr, adj, full, LOWER, UPPER)
-        for roots in root_chunks
-    ]
+    # One task per root (each root's search tree is independent). Tree sizes
+    # differ by orders of magnitude, so submit the largest estimates first;
+    # idle workers pull the next root, which is greedy LPT scheduling.
+    # The compiled kernels release the GIL, so threads suffice and nothing
+    # is pickled; the pure-Python fallback still needs separate processes.
+    # Either way the shared inputs go to each worker once, via _init_worker,
+    # and tasks carry only their root list.
+    estimates = [estimate_tree_size(r, area_arr, adj, full, UPPER) for r in range(n)]
+    root_order = sorted(range(n), key=lambda r: -estimates[r])
+    worker_state = (bit_states, area_arr, adj, full, LOWER, UPPER)
+    compiled = _enumerate_roots_c is not None or _enumerate_roots_numba is not None
+    executor_cls = ThreadPoolExecutor if compiled else ProcessPoolExecutor
 
     # Run workers in parallel
     output_file = "greenland_like_contiguous_state_combos_under.csv"
-    temp_files = []
-    total_count = 0
-
-    with Pool(num_workers) as pool:
-        results = pool.map(enumerate_connected_subsets_for_roots, worker_args)
-
-    for temp_path, count in results:
-        temp_files.append(temp_path)
-        total_count += count
-
-    # Merge temp files into final output
-    sample_rows = []
-    with open(output_file, "w", newline="") as out_f:
-        writer = csv.writer(out_f)
-        writer.writerow(["states_count", "total_km2", "percent_of_greenland", "states"])
-
-        for temp_path in temp_files:
-            with open(temp_path, "r", newline="") as in_f:
-                reader = csv.reader(in_f)
-                for row in reader:
-                    writer.writerow(row)
-                    if len(sample_rows) < 10:
-                        sample_rows.append(row)
-            os.unlink(temp_path)  # Clean up temp file
+    hits_file = "greenland_like_contiguous_state_combos_under.bin"
+
+    with executor_cls(max_workers=num_workers, initializer=_init_worker, initargs=worker_state) as pool:
+        results = pool.map(_enumerate_worker_roots, [[r] for r in root_order])
+        results_by_root = dict(zip(root_order, results))
+    results = [results_by_root.pop(r) for r in range(n)]  # back to root order
+
+    # Merge the per-root top-Ks; concatenating in root order keeps ties in
+    # the same order as the full hit list.
+    top_masks, top_sums = closest_hits(
+        np.concatenate([top[0] for _, _, top in results]),
+        np.concatenate([top[1] for _, _, top in results]),
+        MAX_COMBINATIONS,
+    )
+
+    # Merge the per-root hit buffers into one binary file, then decode to CSV.
+    # Rebind results so the list write_hits_file drains is the only reference
+    # to the buffers, letting each one be freed as soon as it is copied.
+    results = [(m, s) for m, s, _ in results]
+    hits = write_hits_file(hits_file, bit_states, results)
+    total_count = len(hits)
+    write_combinations_csv(output_file, bit_states, hits)
+
+    with open(output_file, "r", newline="") as f:
+        sample_rows = list(islice(csv.reader(f), 1, 11))
 
     print(f"Found {total_count} combinations.")
+    print(f"Wrote: {hits_file}")
     print(f"Wrote: {output_file}")
     print("\nFirst 10 results:")
     print(f"{'states_count':>12} {'total_km2':>12} {'percent_of_greenland':>20} states")
@@ -237,71 +482,92 @@ def main():
         print(f"{row[0]:>12} {row[1]:>12} {row[2]:>20} {row[3]}")
 
     # Also export as JSON for the web app
-    export_json(output_file)
+    write_combinations_json(bit_states, top_masks, top_sums)
 
 
-def export_json(csv_file: str, json_file: str = None, max_combinations: int = 10000):
+def closest_indices(distance: np.ndarray, k: int) -> np.ndarray:
     """
-    Export CSV results to JSON format for the web app.
-    Uses a heap to efficiently find the max_combinations closest to Greenland area.
+    Indices of the k smallest distances, sorted by distance; ties keep row order.
     """
-    import heapq
+    if len(distance) <= k:
+        return np.argsort(distance, kind="stable")
+    kth = np.partition(distance, k - 1)[k - 1]
+    below = np.flatnonzero(distance < kth)
+    ties = np.flatnonzero(distance == kth)[:k - len(below)]
+    idx = np.concatenate([below, ties])
+    return idx[np.argsort(distance[idx], kind="stable")]
+
+def closest_hits(masks: np.ndarray, sums: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The k hits closest to Greenland's area, closest first.
+    """
+    keep = closest_indices(np.abs(100.0 - hits_percent(sums)), k)
+    return masks[keep], sums[keep]
 
+def write_combinations_json(states: List[str], masks: np.ndarray, sums: np.ndarray,
+                            json_file: str = None):
+    """
+    Write already-selected hits as JSON for the web app.
+    """
     if json_file is None:
         json_file = "data/combinations.json"
 
     # Ensure data directory exists
     os.makedirs(os.path.dirname(json_file), exist_ok=True)
 
-    print(f"Reading {csv_file}...")
-
-    # Use a max-heap (negated min-heap) to keep track of top N closest
-    # Heap items: (negated_distance, row_count, combo_dict) - row_count as tiebreaker
-    heap = []
-    row_count = 0
-
-    with open(csv_file, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            row_count += 1
-            if row_count % 1_000_000 == 0:
-                print(f"  Processed {row_count:,} rows...")
-
-            percent = float(row["percent_of_greenland"])
-            distance = abs(100.0 - percent)
-
-            combo = {
-                "states": [s.strip() for s in row["states"].split(",")],
-                "total_km2": int(row["total_km2"]),
-                "percent": percent
-            }
-
-            if len(heap) < max_combinations:
-                heapq.heappush(heap, (-distance, row_count, combo))
-            elif -distance > heap[0][0]:
-                heapq.heapreplace(heap, (-distance, row_count, combo))
-
-    print(f"  Total rows: {row_count:,}")
-
-    # Extract combinations and sort by closeness
-    combinations = [item[2] for item in heap]
-    combinations.sort(key=lambda x: abs(100.0 - x["percent"]))
+    combinations = [
+        {"states": st, "total_km2": km2, "percent": pct}
+        for st, km2, pct in zip(masks_to_states(masks, states), sums.tolist(), hits_percent(sums).tolist())
+    ]
 
     output = {
         "greenland_km2": GREENLAND_KM2,
         "combinations": combinations
     }
 
-    with open(json_file, "w") as f:
-        json.dump(output, f)
+    if orjson is not None:
+        with open(json_file, "wb") as f:
+            f.write(orjson.dumps(output))
+    else:
+        with open(json_file, "w") as f:
+            json.dump(output, f, separators=(",", ":"))
 
     print(f"Wrote JSON: {json_file} ({len(combinations)} combinations)")
 
+def export_json(hits_file: str, json_file: str = None, max_combinations: int = MAX_COMBINATIONS,
+                chunksize: int = 10_000_000):
+    """
+    Export binary hits (see write_hits_file) to JSON format for the web app.
+    Keeps a rolling top-K of the max_combinations closest to Greenland area,
+    selected with np.partition; only those K masks are decoded to names.
+    main() does this selection during enumeration; this is for re-exporting
+    an existing .bin file.
+    """
+    print(f"Reading {hits_file}...")
+    states, hits = read_hits_file(hits_file)
+
+    # Current top-K, in closeness order. Earlier records come first in each
+    # concatenation, so ties keep the earliest.
+    best_masks = np.zeros(0, dtype=np.uint64)
+    best_sums = np.zeros(0, dtype=np.int32)
+    for start in range(0, len(hits), chunksize):
+        chunk = hits[start:start + chunksize]
+        best_masks, best_sums = closest_hits(
+            np.concatenate([best_masks, chunk["mask"]]),
+            np.concatenate([best_sums, chunk["sum"]]),
+            max_combinations,
+        )
+        print(f"  Processed {start + len(chunk):,} rows...")
+
+    print(f"  Total rows: {len(hits):,}")
+
+    write_combinations_json(states, best_masks, best_sums, json_file)
+
 
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1 and sys.argv[1] == "--export-json":
-        csv_file = sys.argv[2] if len(sys.argv) > 2 else "greenland_like_contiguous_state_combos_under.csv"
-        export_json(csv_file)
+        hits_file = sys.argv[2] if len(sys.argv) > 2 else "greenland_like_contiguous_state_combos_under.bin"
+        export_json(hits_file)
     else:
         main()